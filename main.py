@@ -2,9 +2,98 @@ import sys
 import time
 import json
 import os
+import threading
+from collections import deque
+from functools import lru_cache, partial
+import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
 from pynput import keyboard, mouse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+MACRO_FORMATS = {"Portable (.json)": ".json", "Streamable (.jsonl)": ".jsonl"}
+if msgpack is not None:
+    MACRO_FORMATS["Fast (.msgpack)"] = ".msgpack"
+
+def _array_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+def dump_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2, default=_array_default).encode("utf-8")
+
+def load_json(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json_line(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def dump_jsonl(columns):
+    lines = []
+    rows = zip(
+        (columns["t"] / 1e9).tolist(), columns["type"],
+        np.cumsum(columns["x"]).tolist(), np.cumsum(columns["y"]).tolist(),
+        columns["key"], columns["button"], columns["pressed"],
+        columns["dx"].tolist(), columns["dy"].tolist(),
+    )
+    for event_time, event_type, x, y, key, button, pressed, dx, dy in rows:
+        if event_type == KEY_PRESS or event_type == KEY_RELEASE:
+            data = key
+        elif event_type == MOUSE_MOVE:
+            data = {"x": x, "y": y}
+        elif event_type == MOUSE_CLICK:
+            data = {"x": x, "y": y, "button": button, "pressed": pressed}
+        else:
+            data = {"x": x, "y": y, "dx": dx, "dy": dy}
+        lines.append(dump_json_line({"time": event_time, "type": event_type, "data": data}))
+    return b"".join(lines)
+
+def dump_msgpack(obj):
+    return msgpack.packb(obj, use_bin_type=True, default=_array_default)
+
+def load_msgpack(data):
+    return msgpack.unpackb(data, raw=False)
+
+def encode_macro(obj, ext):
+    if ext == ".msgpack":
+        return dump_msgpack(obj)
+    if ext == ".jsonl":
+        return dump_jsonl(obj)
+    return dump_json(obj)
+
+def decode_macro(data, ext):
+    if ext == ".msgpack":
+        return load_msgpack(data)
+    return load_json(data)
+
+KEY_PRESS = 0
+KEY_RELEASE = 1
+MOUSE_MOVE = 2
+MOUSE_CLICK = 3
+MOUSE_SCROLL = 4
+EVENT_TYPES = ("key_press", "key_release", "mouse_move", "mouse_click", "mouse_scroll")
+EVENT_TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
 def serialize_key(key):
     try:
         if hasattr(key, 'char') and key.char is not None:
@@ -14,28 +103,35 @@ def serialize_key(key):
     except AttributeError:
         return {"vtype": "str", "value": str(key)}
 
+@lru_cache(maxsize=512)
+def _keycode_from_char(char):
+    return keyboard.KeyCode.from_char(char)
+
+_KEY_BY_NAME = dict(keyboard.Key.__members__)
+_BTN_BY_NAME = dict(mouse.Button.__members__)
+
 def deserialize_key(data):
     if data["vtype"] == "KeyCode":
-        return keyboard.KeyCode.from_char(data["char"])
+        return _keycode_from_char(data["char"])
     elif data["vtype"] == "Key":
-        return getattr(keyboard.Key, data["name"])
+        return _KEY_BY_NAME[data["name"]]
     else:
-        return keyboard.KeyCode.from_char(data.get("value", ""))
+        return _keycode_from_char(data.get("value", ""))
 
 def serialize_mouse_button(button):
     return button.name
 
 def deserialize_mouse_button(name):
-    return getattr(mouse.Button, name)
+    return _BTN_BY_NAME[name]
 
 def serialize_event(event):
     event_time, event_type, event_data = event
     result = {"time": event_time, "type": event_type}
-    if event_type in ["key_press", "key_release"]:
+    if event_type == KEY_PRESS or event_type == KEY_RELEASE:
         result["data"] = serialize_key(event_data)
-    elif event_type == "mouse_move":
+    elif event_type == MOUSE_MOVE:
         result["data"] = {"x": event_data[0], "y": event_data[1]}
-    elif event_type == "mouse_click":
+    elif event_type == MOUSE_CLICK:
         x, y, button, pressed = event_data
         result["data"] = {
             "x": x,
@@ -43,7 +139,7 @@ def serialize_event(event):
             "button": serialize_mouse_button(button),
             "pressed": pressed
         }
-    elif event_type == "mouse_scroll":
+    elif event_type == MOUSE_SCROLL:
         x, y, dx, dy = event_data
         result["data"] = {"x": x, "y": y, "dx": dx, "dy": dy}
     else:
@@ -53,56 +149,264 @@ def serialize_event(event):
 def deserialize_event(event_dict):
     event_time = event_dict["time"]
     event_type = event_dict["type"]
+    if isinstance(event_type, str):
+        event_type = EVENT_TYPE_CODES.get(event_type, event_type)
     data = event_dict["data"]
-    if event_type in ["key_press", "key_release"]:
+    if event_type == KEY_PRESS or event_type == KEY_RELEASE:
         key = deserialize_key(data)
         return event_time, event_type, key
-    elif event_type == "mouse_move":
+    elif event_type == MOUSE_MOVE:
         return event_time, event_type, (data["x"], data["y"])
-    elif event_type == "mouse_click":
+    elif event_type == MOUSE_CLICK:
         button = deserialize_mouse_button(data["button"])
         return event_time, event_type, (data["x"], data["y"], button, data["pressed"])
-    elif event_type == "mouse_scroll":
+    elif event_type == MOUSE_SCROLL:
         return event_time, event_type, (data["x"], data["y"], data["dx"], data["dy"])
     else:
         return event_time, event_type, data
 
-class MacroRecorder:
+SOA_COLUMNS = ("t", "type", "x", "y", "key", "button", "pressed", "dx", "dy")
+SOA_VERSION = 3
+SOA_NUMERIC_DTYPES = {
+    "t": np.float64,
+    "type": np.int8,
+    "x": np.int64,
+    "y": np.int64,
+    "pressed": bool,
+    "dx": np.int64,
+    "dy": np.int64,
+}
+SOA_DECODE_CHUNK = 4096
+
+def new_soa_columns():
+    return {name: [] for name in SOA_COLUMNS}
+
+def append_event_soa(columns, event):
+    event_time, event_type, event_data = event
+    x = y = dx = dy = 0
+    key = button = None
+    pressed = False
+    if event_type == KEY_PRESS or event_type == KEY_RELEASE:
+        key = serialize_key(event_data)
+    elif event_type == MOUSE_MOVE:
+        x, y = event_data
+    elif event_type == MOUSE_CLICK:
+        x, y, button, pressed = event_data
+        button = serialize_mouse_button(button)
+    elif event_type == MOUSE_SCROLL:
+        x, y, dx, dy = event_data
+    columns["t"].append(event_time)
+    columns["type"].append(event_type)
+    columns["x"].append(x)
+    columns["y"].append(y)
+    columns["key"].append(key)
+    columns["button"].append(button)
+    columns["pressed"].append(pressed)
+    columns["dx"].append(dx)
+    columns["dy"].append(dy)
+
+def finalize_soa(columns):
+    t = np.asarray(columns["t"], dtype=np.int64)
+    result = {
+        "version": SOA_VERSION,
+        "t": t,
+        "type": columns["type"],
+        "x": np.asarray(columns["x"], dtype=np.int32),
+        "y": np.asarray(columns["y"], dtype=np.int32),
+        "key": columns["key"],
+        "button": columns["button"],
+        "pressed": columns["pressed"],
+        "dx": np.asarray(columns["dx"], dtype=np.int32),
+        "dy": np.asarray(columns["dy"], dtype=np.int32),
+    }
+    if len(t) > 1 and np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind="stable")
+        for name in SOA_COLUMNS:
+            column = result[name]
+            if isinstance(column, np.ndarray):
+                result[name] = column[order]
+            else:
+                result[name] = [column[i] for i in order.tolist()]
+    types = np.asarray(result["type"], dtype=np.int8)
+    has_position = (types == MOUSE_MOVE) | (types == MOUSE_CLICK) | (types == MOUSE_SCROLL)
+    source = np.maximum.accumulate(np.where(has_position, np.arange(len(types)), 0))
+    for name in ("x", "y"):
+        result[name] = np.diff(result[name][source], prepend=0)
+    return result
+
+def _assemble_events(columns, keys, buttons):
+    version = columns.get("version", 1)
+    t = np.asarray(columns["t"], dtype=np.float64)
+    if version >= 3:
+        t = t / 1e9
+    xs = np.asarray(columns["x"], dtype=np.int64)
+    ys = np.asarray(columns["y"], dtype=np.int64)
+    if version >= 2:
+        xs = np.cumsum(xs)
+        ys = np.cumsum(ys)
+    types = np.asarray(columns["type"], dtype=np.int8)
+    pressed = np.asarray(columns["pressed"], dtype=bool)
+    dxs = np.asarray(columns["dx"])
+    dys = np.asarray(columns["dy"])
+    events = []
+    for start in range(0, len(t), SOA_DECODE_CHUNK):
+        stop = start + SOA_DECODE_CHUNK
+        rows = zip(
+            t[start:stop].tolist(), types[start:stop].tolist(),
+            xs[start:stop].tolist(), ys[start:stop].tolist(),
+            keys[start:stop], buttons[start:stop], pressed[start:stop].tolist(),
+            dxs[start:stop].tolist(), dys[start:stop].tolist(),
+        )
+        for event_time, event_type, x, y, key, button, is_pressed, dx, dy in rows:
+            if event_type == KEY_PRESS or event_type == KEY_RELEASE:
+                events.append((event_time, event_type, key))
+            elif event_type == MOUSE_MOVE:
+                events.append((event_time, event_type, (x, y)))
+            elif event_type == MOUSE_CLICK:
+                events.append((event_time, event_type, (x, y, button, is_pressed)))
+            elif event_type == MOUSE_SCROLL:
+                events.append((event_time, event_type, (x, y, dx, dy)))
+    return events
+
+def deserialize_events_soa(columns):
+    keys = [None if k is None else deserialize_key(k) for k in columns["key"]]
+    buttons = [None if b is None else deserialize_mouse_button(b) for b in columns["button"]]
+    return _assemble_events(columns, keys, buttons)
+
+def deserialize_macro(data):
+    if isinstance(data, list):
+        return [deserialize_event(e) for e in data]
+    return deserialize_events_soa(data)
+
+def _iter_array_values(parser, name):
+    item = name + ".item"
+    for prefix, event, value in parser:
+        if prefix == item:
+            yield value
+        elif prefix == name and event == "end_array":
+            return
+
+def _stream_keys(parser):
+    keys = []
+    key = None
+    for prefix, event, value in parser:
+        if prefix == "key.item":
+            if event == "null":
+                keys.append(None)
+            elif event == "start_map":
+                key = {}
+            elif event == "end_map":
+                keys.append(deserialize_key(key))
+        elif prefix.startswith("key.item."):
+            key[prefix[len("key.item."):]] = value
+        elif prefix == "key" and event == "end_array":
+            return keys
+    return keys
+
+def _stream_soa_macro(infile):
+    parser = ijson.parse(infile, use_float=True)
+    columns = {}
+    keys = buttons = None
+    for prefix, event, value in parser:
+        if prefix != "" or event != "map_key":
+            continue
+        if value in SOA_NUMERIC_DTYPES:
+            columns[value] = np.fromiter(_iter_array_values(parser, value), dtype=SOA_NUMERIC_DTYPES[value])
+        elif value == "key":
+            keys = _stream_keys(parser)
+        elif value == "button":
+            buttons = [None if b is None else deserialize_mouse_button(b) for b in _iter_array_values(parser, value)]
+        else:
+            columns[value] = next(parser)[2]
+    return _assemble_events(columns, keys, buttons)
+
+def _stream_json_macro(infile):
+    head = infile.read(64).lstrip()
+    infile.seek(0)
+    if head.startswith(b"["):
+        return [deserialize_event(e) for e in ijson.items(infile, "item", use_float=True)]
+    return _stream_soa_macro(infile)
+
+def write_macro_file(filename, payload):
+    save_file = QtCore.QSaveFile(filename)
+    if not save_file.open(QtCore.QIODevice.WriteOnly):
+        raise OSError(save_file.errorString())
+    if save_file.write(payload) != len(payload):
+        save_file.cancelWriting()
+        raise OSError(save_file.errorString())
+    if not save_file.commit():
+        raise OSError(save_file.errorString())
+
+def load_macro_file(filename):
+    ext = os.path.splitext(filename)[1]
+    with open(filename, "rb") as infile:
+        if ext == ".jsonl":
+            return [deserialize_event(load_json(line)) for line in infile if line.strip()]
+        if ext == ".json" and ijson is not None:
+            return _stream_json_macro(infile)
+        return deserialize_macro(decode_macro(infile.read(), ext))
+
+MOVE_COALESCE_INTERVAL_NS = 16_000_000
+
+class MacroRecorder(QtCore.QObject):
+    stopped = QtCore.pyqtSignal(object)
+
     def __init__(self):
-        self.events = []
+        super().__init__()
+        self.columns = new_soa_columns()
         self.recording = False
-        self.start_time = None
+        self._clock = None
         self.stop_hotkey = keyboard.Key.f12
         self.hotkey_triggered = False
-        self.on_stop = None
+        self._last_move_t = -MOVE_COALESCE_INTERVAL_NS
+        self._pending_move = None
+        self._staging = deque()
+        self._lock = threading.Lock()
 
     def start_recording(self):
-        self.events = []
+        self.columns = new_soa_columns()
+        self._staging = deque()
         self.recording = True
-        self.start_time = time.time()
+        self._clock = QtCore.QElapsedTimer()
+        self._clock.start()
         self.hotkey_triggered = False
+        self._last_move_t = -MOVE_COALESCE_INTERVAL_NS
+        self._pending_move = None
 
         self.keyboard_listener = keyboard.Listener(
             on_press=self.on_key_press,
             on_release=self.on_key_release
         )
         self.mouse_listener = mouse.Listener(
+            on_move=self.on_move,
             on_click=self.on_click,
             on_scroll=self.on_scroll
         )
         self.keyboard_listener.start()
         self.mouse_listener.start()
 
+        self.move_timer = QtCore.QTimer()
+        self.move_timer.timeout.connect(self.flush_pending_move)
+        self.move_timer.start(16)
+        self.drain_timer = QtCore.QTimer()
+        self.drain_timer.timeout.connect(self.drain_events)
+        self.drain_timer.start(250)
+
     def stop_recording(self):
         if not self.recording:
-            return self.events
+            return self.columns
         self.recording = False
         self.keyboard_listener.stop()
         self.mouse_listener.stop()
-        if self.on_stop:
-            QtCore.QTimer.singleShot(0, lambda: self.on_stop(self.events))
-        return self.events
+        self.move_timer.stop()
+        self.drain_timer.stop()
+        self.flush_pending_move()
+        self.drain_events()
+        columns = self.columns
+        self.stopped.emit(columns)
+        return columns
 
+    @QtCore.pyqtSlot()
     def stop_recording_from_hotkey(self):
         if self.recording:
             self.stop_recording()
@@ -110,67 +414,140 @@ class MacroRecorder:
     def record_event(self, event_type, event_data):
         if not self.recording:
             return
-        event_time = time.time() - self.start_time
-        self.events.append((event_time, event_type, event_data))
+        event_time = self._clock.nsecsElapsed()
+        self._staging.append((event_time, event_type, event_data))
+
+    def event_count(self):
+        return len(self._staging) + len(self.columns["t"])
+
+    def drain_events(self):
+        staging = self._staging
+        columns = self.columns
+        while staging:
+            append_event_soa(columns, staging.popleft())
+
+    def _emit_pending_move(self):
+        pending = self._pending_move
+        if pending is None:
+            return
+        self._pending_move = None
+        event_time, x, y = pending
+        self._last_move_t = event_time
+        self._staging.append((event_time, MOUSE_MOVE, (x, y)))
+
+    def flush_pending_move(self):
+        with self._lock:
+            self._emit_pending_move()
+
+    def record_mouse_event(self, event_type, event_data):
+        if not self.recording:
+            return
+        with self._lock:
+            self._emit_pending_move()
+            event_time = self._clock.nsecsElapsed()
+            self._staging.append((event_time, event_type, event_data))
 
     def on_key_press(self, key):
         if key == self.stop_hotkey:
             if not self.hotkey_triggered:
                 self.hotkey_triggered = True
-                QtCore.QTimer.singleShot(0, self.stop_recording_from_hotkey)
+                QtCore.QMetaObject.invokeMethod(
+                    self, "stop_recording_from_hotkey", QtCore.Qt.QueuedConnection
+                )
             return
-        self.record_event('key_press', key)
+        self.record_event(KEY_PRESS, key)
 
     def on_key_release(self, key):
         if key == self.stop_hotkey:
             return
-        self.record_event('key_release', key)
+        self.record_event(KEY_RELEASE, key)
+
+    def on_move(self, x, y):
+        if not self.recording:
+            return
+        t = self._clock.nsecsElapsed()
+        with self._lock:
+            if t - self._last_move_t < MOVE_COALESCE_INTERVAL_NS:
+                self._pending_move = (t, x, y)
+                return
+            self._last_move_t = t
+            self._pending_move = None
+            self._staging.append((t, MOUSE_MOVE, (x, y)))
 
     def on_click(self, x, y, button, pressed):
-        self.record_event('mouse_click', (x, y, button, pressed))
+        self.record_mouse_event(MOUSE_CLICK, (x, y, button, pressed))
 
     def on_scroll(self, x, y, dx, dy):
-        self.record_event('mouse_scroll', (x, y, dx, dy))
+        self.record_mouse_event(MOUSE_SCROLL, (x, y, dx, dy))
+
+SPIN_THRESHOLD_NS = 1_000_000
+
+def _move_then(mouse_controller, position, action, *args):
+    mouse_controller.position = position
+    action(*args)
+
+def _compile_action(event_type, event_data, kb_controller, mouse_controller):
+    if event_type == KEY_PRESS:
+        return partial(kb_controller.press, event_data)
+    elif event_type == KEY_RELEASE:
+        return partial(kb_controller.release, event_data)
+    elif event_type == MOUSE_MOVE:
+        return partial(setattr, mouse_controller, "position", event_data)
+    elif event_type == MOUSE_CLICK:
+        x, y, button, pressed = event_data
+        if pressed:
+            return partial(_move_then, mouse_controller, (x, y), mouse_controller.press, button)
+        return partial(_move_then, mouse_controller, (x, y), mouse_controller.release, button)
+    elif event_type == MOUSE_SCROLL:
+        x, y, dx, dy = event_data
+        return partial(_move_then, mouse_controller, (x, y), mouse_controller.scroll, dx, dy)
+    return None
+
+def play_loop(times_ns, type_codes, actions, should_stop):
+    clock = time.perf_counter_ns
+    sl = time.sleep
+    start = clock()
+    for event_time, event_type, action in zip(times_ns.tolist(), type_codes.tolist(), actions):
+        if should_stop():
+            break
+
+        wait = event_time - (clock() - start)
+        if wait > SPIN_THRESHOLD_NS:
+            sl((wait - SPIN_THRESHOLD_NS) * 1e-9)
+        while clock() - start < event_time:
+            pass
+        if should_stop():
+            break
+
+        try:
+            action()
+        except Exception as e:
+            print(f"Error on {EVENT_TYPES[event_type]}: {e}")
 
 class MacroPlayer:
     def __init__(self, events):
         self.events = events
+        kb_controller = keyboard.Controller()
+        mouse_controller = mouse.Controller()
+        times = []
+        type_codes = []
+        self.actions = []
+        for event_time, event_type, event_data in events:
+            action = _compile_action(event_type, event_data, kb_controller, mouse_controller)
+            if action is None:
+                continue
+            times.append(event_time)
+            type_codes.append(event_type)
+            self.actions.append(action)
+        self.times_ns = np.rint(np.asarray(times, dtype=np.float64) * 1e9).astype(np.int64)
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
         self._stop = False
 
+    def _should_stop(self):
+        return self._stop
+
     def play(self):
-        kb_controller = keyboard.Controller()
-        mouse_controller = mouse.Controller()
-        start_time = time.time()
-        for event in self.events:
-            if self._stop:
-                break
-
-            event_time, event_type, event_data = event
-            time_to_wait = event_time - (time.time() - start_time)
-            if time_to_wait > 0:
-                time.sleep(time_to_wait)
-            if self._stop:
-                break
-
-            if event_type == 'key_press':
-                try:
-                    kb_controller.press(event_data)
-                except Exception as e:
-                    print(f"Error on key press: {e}")
-            elif event_type == 'key_release':
-                try:
-                    kb_controller.release(event_data)
-                except Exception as e:
-                    print(f"Error on key release: {e}")
-            elif event_type == 'mouse_click':
-                x, y, button, pressed = event_data
-                if pressed:
-                    mouse_controller.press(button)
-                else:
-                    mouse_controller.release(button)
-            elif event_type == 'mouse_scroll':
-                x, y, dx, dy = event_data
-                mouse_controller.scroll(dx, dy)
+        play_loop(self.times_ns, self.type_codes, self.actions, self._should_stop)
 
 class MacroPlayerWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
@@ -198,6 +575,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle("Macro Program")
         self.setGeometry(100, 100, 800, 600)
         self.recorder = MacroRecorder()
+        self.recorder.stopped.connect(self.on_recording_stopped, QtCore.Qt.QueuedConnection)
 
         self.macros_folder = "macros"
         os.makedirs(self.macros_folder, exist_ok=True)
@@ -225,6 +603,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.countdown_label = QtWidgets.QLabel("")
         self.record_layout.addWidget(self.countdown_label)
 
+        self.event_count_label = QtWidgets.QLabel("")
+        self.record_layout.addWidget(self.event_count_label)
+        self._last_count = None
+
         self.event_list = QtWidgets.QListWidget()
         self.record_layout.addWidget(self.event_list)
 
@@ -270,7 +652,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def refresh_macro_list(self):
         self.macro_dropdown.clear()
-        macro_files = [f for f in os.listdir(self.macros_folder) if f.endswith(".json")]
+        macro_files = [f for f in os.listdir(self.macros_folder) if f.endswith(tuple(MACRO_FORMATS.values()))]
         if not macro_files:
             self.macro_dropdown.addItem("No macros found")
             self.macro_dropdown.setEnabled(False)
@@ -282,6 +664,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(False)
         self.event_list.clear()
+        self.event_count_label.setText("")
         self.countdown_value = 3
         self.countdown_label.setText(f"Recording starts in {self.countdown_value} seconds...")
         self.countdown_timer = QtCore.QTimer()
@@ -298,9 +681,10 @@ class MainWindow(QtWidgets.QMainWindow):
             self.begin_recording()
 
     def begin_recording(self):
-        self.recorder.on_stop = self.on_recording_stopped
         self.recorder.start_recording()
         self.stop_button.setEnabled(True)
+        self._last_count = None
+        self.update_event_list()
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.update_event_list)
         self.timer.start(100)
@@ -312,40 +696,46 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         if hasattr(self, 'timer'):
             self.timer.stop()
-        events = self.recorder.stop_recording()
+        columns = self.recorder.stop_recording()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.event_list.addItem(f"Recording stopped. Total events: {len(events)}")
+        self.event_list.addItem(f"Recording stopped. Total events: {len(columns['t'])}")
 
-    def on_recording_stopped(self, events):
+    def on_recording_stopped(self, columns):
         if hasattr(self, 'timer'):
             self.timer.stop()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.event_list.addItem(f"Recording stopped (hotkey). Total events: {len(events)}")
+        self.event_list.addItem(f"Recording stopped (hotkey). Total events: {len(columns['t'])}")
 
     def update_event_list(self):
-        count = len(self.recorder.events)
-        self.event_list.clear()
-        self.event_list.addItem(f"Recording... Events recorded: {count}")
-        self.event_list.addItem("Press F12 to stop recording.")
+        count = self.recorder.event_count()
+        if count != self._last_count:
+            self.event_count_label.setText(f"Recording... Events recorded: {count}")
+            self._last_count = count
 
     def save_macro(self):
-        if not self.recorder.events:
+        if not self.recorder.columns["t"]:
             QtWidgets.QMessageBox.warning(self, "No Macro", "There is no macro to save")
             return
 
         name, ok = QtWidgets.QInputDialog.getText(self, "Save Macro", "Enter macro name:")
-        if ok and name:
-            filename = os.path.join(self.macros_folder, f"{name}.json")
-            try:
-                with open(filename, "w") as outfile:
-                    json_events = [serialize_event(e) for e in self.recorder.events]
-                    json.dump(json_events, outfile, indent=4)
-                self.event_list.addItem(f"Macro saved as {filename}")
-                self.refresh_macro_list()
-            except Exception as e:
-                QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save macro: {e}")
+        if not ok or not name:
+            return
+        fmt, ok = QtWidgets.QInputDialog.getItem(
+            self, "Save Macro", "Select format:", list(MACRO_FORMATS), 0, False
+        )
+        if not ok:
+            return
+        ext = MACRO_FORMATS[fmt]
+        filename = os.path.join(self.macros_folder, f"{name}{ext}")
+        try:
+            columns = finalize_soa(self.recorder.columns)
+            write_macro_file(filename, encode_macro(columns, ext))
+            self.event_list.addItem(f"Macro saved as {filename}")
+            self.refresh_macro_list()
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save macro: {e}")
 
     def play_macro(self):
         macro_file = self.macro_dropdown.currentText()
@@ -355,9 +745,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         filename = os.path.join(self.macros_folder, macro_file)
         try:
-            with open(filename, "r") as infile:
-                json_events = json.load(infile)
-            self.events_to_play = [deserialize_event(e) for e in json_events]
+            self.events_to_play = load_macro_file(filename)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load macro: {e}")
             return